@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+import csv
 import json
 import logging
 import os
 import re
-import tempfile
 import warnings
-import zipfile
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import MappingProxyType
 from typing import Any, Optional
@@ -16,7 +16,10 @@ import dask.array as da
 import numpy as np
 import packaging.version
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
+import shapely
 import tifffile
 import zarr
 from anndata import AnnData
@@ -24,7 +27,6 @@ from dask.dataframe import read_parquet
 from dask_image.imread import imread
 from datatree.datatree import DataTree
 from geopandas import GeoDataFrame
-from joblib import Parallel, delayed
 from pyarrow import Table
 from shapely import Polygon
 from spatialdata import SpatialData
@@ -37,6 +39,8 @@ from spatialdata.models import (
     ShapesModel,
     TableModel,
 )
+from spatialdata.transformations import set_transformation
+from spatialdata.transformations._utils import compute_coordinates
 from spatialdata.transformations.transformations import Affine, Identity, Scale
 from xarray import DataArray
 
@@ -48,6 +52,11 @@ from spatialdata_io.readers._utils._utils import _initialize_raster_models_kwarg
 
 __all__ = ["xenium", "xenium_aligned_image", "xenium_explorer_selection"]
 
+_XENIUM_ANALYZER_VERSION_PATTERN = re.compile(r"^(?:x|X)enium-(\d+\.\d+\.\d+(\.\d+-\d+)?)")
+_PARSED_VERSION_KEY = "_parsed_version"
+# dimensions of the aligned images given the axes of their TIFF series; "S" is the samples axis of RGB images
+_TIFF_AXES_TO_DIMS = {"YXS": ("y", "x", "c"), "CYX": ("c", "y", "x")}
+
 
 @deprecation_alias(cells_as_shapes="cells_as_circles", cell_boundaries="cells_boundaries", cell_labels="cells_labels")
 @inject_docs(xx=XeniumKeys)
@@ -117,7 +126,8 @@ def xenium(
     cells_table
         Whether to read the cell annotations in the `AnnData` table.
     n_jobs
-        Number of jobs to use for parallel processing.
+        Number of threads used to read the labels, boundaries, transcripts and images in parallel. Negative values
+        follow the `joblib` convention, e.g. `-1` uses all the CPUs.
     imread_kwargs
         Keyword arguments to pass to the image reader.
     image_models_kwargs
@@ -148,6 +158,8 @@ def xenium(
     ... )
     >>> sdata.write("path/to/data.zarr")
     """
+    if n_jobs == 0:
+        raise ValueError("`n_jobs` must be a positive number of threads, or negative to count from the number of CPUs.")
     if cells_as_circles is None:
         cells_as_circles = True
         warnings.warn(
@@ -160,6 +172,9 @@ def xenium(
         image_models_kwargs, labels_models_kwargs
     )
     path = Path(path)
+    # besides the content of the specs file, `specs` holds entries added by the reader and shared with the readers of
+    # the elements: "region", and the parsed version of the Xenium Analyzer, which `_parse_version_of_xenium_analyzer()`
+    # caches under the private `_PARSED_VERSION_KEY` ("_parsed_version") key
     with open(path / XeniumKeys.XENIUM_SPECS) as f:
         specs = json.load(f)
     # to trigger the warning if the version cannot be parsed
@@ -204,11 +219,126 @@ def xenium(
         table.obs[XeniumKeys.Z_LEVEL] = cell_summary_table[XeniumKeys.Z_LEVEL]
         table.obs[XeniumKeys.NUCLEUS_COUNT] = cell_summary_table[XeniumKeys.NUCLEUS_COUNT]
 
-    polygons = {}
-    labels = {}
+    labels: dict[str, DataArray | DataTree] = {}
     tables = {}
-    points = {}
-    images = {}
+
+    # the morphology focus directory is checked before starting the readers, so that an error is raised right away
+    if morphology_focus and version is not None and version >= packaging.version.parse("2.0.0"):
+        morphology_focus_dir = path / XeniumKeys.MORPHOLOGY_FOCUS_DIR
+        with os.scandir(morphology_focus_dir) as entries:
+            files = {entry.name for entry in entries if entry.name.endswith(".ome.tif")}
+        if len(files) not in [1, 4]:
+            raise ValueError(
+                "Expected 1 (no segmentation kit) or 4 (segmentation kit) files in the morphology focus directory, "
+                f"found {len(files)}: {files}"
+            )
+        if files != {XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.value.format(i) for i in range(len(files))}:
+            raise ValueError(
+                "Expected files in the morphology focus directory to be named as "
+                f"{XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.value.format(0)} to "
+                f"{XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.value.format(len(files) - 1)}, found {files}"
+            )
+        # the 'dummy' channel is a temporary workaround, see _get_images() for more details
+        if len(files) == 1:
+            channel_names = {
+                0: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_0.value,
+            }
+        else:
+            channel_names = {
+                0: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_0.value,
+                1: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_1.value,
+                2: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_2.value,
+                3: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_3.value,
+                4: "dummy",
+            }
+        # each channel file is read on its own, reusing its pyramid; when falling back to dask.image.imread, the first
+        # file gives all the 1 or 4 channels (the other files are parsed automatically) and tifffile will give a warning
+        # saying that reading multi-file pyramids is not supported; since in that case we are reading the full scale
+        # image and reconstructing the pyramid, we can ignore this
+        _install_tifffile_filter()
+        assert (
+            "c_coords" not in image_models_kwargs
+        ), "The channel names for the morphology focus images are handled internally"
+
+    # the readers below are independent of each other and spend most of their time reading and decompressing data,
+    # which releases the GIL; they are run in a thread pool and their results are collected at the end
+    labels_future = None
+    polygons_futures = {}
+    points_futures = {}
+    images_futures = {}
+    aligned_images_future = None
+    n_workers = n_jobs if n_jobs > 0 else max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        if nucleus_labels or cells_labels:
+            labels_future = executor.submit(
+                _get_labels,
+                path,
+                XeniumKeys.CELLS_ZARR,
+                specs,
+                nucleus_labels=nucleus_labels,
+                cells_labels=cells_labels,
+                labels_models_kwargs=labels_models_kwargs,
+            )
+
+        if nucleus_boundaries or cells_boundaries:
+            # the polygons only read the cell ids, so a single view (no copy) is shared between them
+            cell_id_idx = table.obs[str(XeniumKeys.CELL_ID)].to_numpy()
+
+        if nucleus_boundaries:
+            polygons_futures["nucleus_boundaries"] = executor.submit(
+                _get_polygons,
+                path,
+                XeniumKeys.NUCLEUS_BOUNDARIES_FILE,
+                specs,
+                idx=cell_id_idx,
+            )
+
+        if cells_boundaries:
+            polygons_futures["cell_boundaries"] = executor.submit(
+                _get_polygons,
+                path,
+                XeniumKeys.CELL_BOUNDARIES_FILE,
+                specs,
+                idx=cell_id_idx,
+            )
+
+        if transcripts:
+            points_futures["transcripts"] = executor.submit(_get_points, path, specs)
+
+        if version is None or version < packaging.version.parse("2.0.0"):
+            if morphology_mip:
+                images_futures["morphology_mip"] = executor.submit(
+                    _get_images,
+                    path,
+                    XeniumKeys.MORPHOLOGY_MIP_FILE,
+                    imread_kwargs,
+                    image_models_kwargs,
+                )
+            if morphology_focus:
+                images_futures["morphology_focus"] = executor.submit(
+                    _get_images,
+                    path,
+                    XeniumKeys.MORPHOLOGY_FOCUS_FILE,
+                    imread_kwargs,
+                    image_models_kwargs,
+                )
+        else:
+            if morphology_focus:
+                images_futures["morphology_focus"] = executor.submit(
+                    _get_images,
+                    morphology_focus_dir,
+                    [XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.format(i) for i in range(len(files))],
+                    imread_kwargs,
+                    {**image_models_kwargs, "c_coords": list(channel_names.values())},
+                )
+
+        # find additional aligned images
+        if aligned_images:
+            aligned_images_future = executor.submit(_add_aligned_images, path, imread_kwargs, image_models_kwargs)
+
+    points = {name: future.result() for name, future in points_futures.items()}
+    images = {name: future.result() for name, future in images_futures.items()}
+    polygons = {name: future.result() for name, future in polygons_futures.items()}
 
     # From the public release notes here:
     # https://www.10xgenomics.com/support/software/xenium-onboard-analysis/latest/release-notes/release-notes-for-xoa
@@ -216,24 +346,8 @@ def xenium(
     # This column is currently not found in the preview data, while I think it is needed in order to unambiguously match
     # nuclei to cells. Therefore for the moment we only link the table to the cell labels, and not to the nucleus
     # labels.
-    if nucleus_labels:
-        labels["nucleus_labels"], _ = _get_labels_and_indices_mapping(
-            path,
-            XeniumKeys.CELLS_ZARR,
-            specs,
-            mask_index=0,
-            labels_name="nucleus_labels",
-            labels_models_kwargs=labels_models_kwargs,
-        )
-    if cells_labels:
-        labels["cell_labels"], cell_labels_indices_mapping = _get_labels_and_indices_mapping(
-            path,
-            XeniumKeys.CELLS_ZARR,
-            specs,
-            mask_index=1,
-            labels_name="cell_labels",
-            labels_models_kwargs=labels_models_kwargs,
-        )
+    if labels_future is not None:
+        labels, cell_labels_indices_mapping = labels_future.result()
         if cell_labels_indices_mapping is not None and table is not None:
             if not pd.DataFrame.equals(cell_labels_indices_mapping["cell_id"], table.obs[str(XeniumKeys.CELL_ID)]):
                 warnings.warn(
@@ -248,98 +362,6 @@ def xenium(
                 if not cells_as_circles:
                     table.uns[TableModel.ATTRS_KEY][TableModel.INSTANCE_KEY] = "cell_labels"
 
-    if nucleus_boundaries:
-        polygons["nucleus_boundaries"] = _get_polygons(
-            path,
-            XeniumKeys.NUCLEUS_BOUNDARIES_FILE,
-            specs,
-            n_jobs,
-            idx=table.obs[str(XeniumKeys.CELL_ID)].copy(),
-        )
-
-    if cells_boundaries:
-        polygons["cell_boundaries"] = _get_polygons(
-            path,
-            XeniumKeys.CELL_BOUNDARIES_FILE,
-            specs,
-            n_jobs,
-            idx=table.obs[str(XeniumKeys.CELL_ID)].copy(),
-        )
-
-    if transcripts:
-        points["transcripts"] = _get_points(path, specs)
-
-    if version is None or version < packaging.version.parse("2.0.0"):
-        if morphology_mip:
-            images["morphology_mip"] = _get_images(
-                path,
-                XeniumKeys.MORPHOLOGY_MIP_FILE,
-                imread_kwargs,
-                image_models_kwargs,
-            )
-        if morphology_focus:
-            images["morphology_focus"] = _get_images(
-                path,
-                XeniumKeys.MORPHOLOGY_FOCUS_FILE,
-                imread_kwargs,
-                image_models_kwargs,
-            )
-    else:
-        if morphology_focus:
-            morphology_focus_dir = path / XeniumKeys.MORPHOLOGY_FOCUS_DIR
-            files = {f for f in os.listdir(morphology_focus_dir) if f.endswith(".ome.tif")}
-            if len(files) not in [1, 4]:
-                raise ValueError(
-                    "Expected 1 (no segmentation kit) or 4 (segmentation kit) files in the morphology focus directory, "
-                    f"found {len(files)}: {files}"
-                )
-            if files != {XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.value.format(i) for i in range(len(files))}:
-                raise ValueError(
-                    "Expected files in the morphology focus directory to be named as "
-                    f"{XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.value.format(0)} to "
-                    f"{XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.value.format(len(files) - 1)}, found {files}"
-                )
-            # the 'dummy' channel is a temporary workaround, see _get_images() for more details
-            if len(files) == 1:
-                channel_names = {
-                    0: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_0.value,
-                }
-            else:
-                channel_names = {
-                    0: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_0.value,
-                    1: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_1.value,
-                    2: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_2.value,
-                    3: XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_3.value,
-                    4: "dummy",
-                }
-            # this reads the scale 0 for all the 1 or 4 channels (the other files are parsed automatically)
-            # dask.image.imread will call tifffile.imread which will give a warning saying that reading multi-file
-            # pyramids is not supported; since we are reading the full scale image and reconstructing the pyramid, we
-            # can ignore this
-
-            class IgnoreSpecificMessage(logging.Filter):
-                def filter(self, record: logging.LogRecord) -> bool:
-                    # Ignore specific log message
-                    if "OME series cannot read multi-file pyramids" in record.getMessage():
-                        return False
-                    return True
-
-            logger = tifffile.logger()
-            logger.addFilter(IgnoreSpecificMessage())
-            image_models_kwargs = dict(image_models_kwargs)
-            assert (
-                "c_coords" not in image_models_kwargs
-            ), "The channel names for the morphology focus images are handled internally"
-            image_models_kwargs["c_coords"] = list(channel_names.values())
-            images["morphology_focus"] = _get_images(
-                morphology_focus_dir,
-                XeniumKeys.MORPHOLOGY_FOCUS_CHANNEL_IMAGE.format(0),
-                imread_kwargs,
-                image_models_kwargs,
-            )
-            del image_models_kwargs["c_coords"]
-            logger.removeFilter(IgnoreSpecificMessage())
-
     if table is not None:
         tables["table"] = table
 
@@ -348,9 +370,9 @@ def xenium(
         elements_dict["shapes"][specs["region"]] = circles
     sdata = SpatialData(**elements_dict)
 
-    # find and add additional aligned images
-    if aligned_images:
-        extra_images = _add_aligned_images(path, imread_kwargs, image_models_kwargs)
+    # add the additional aligned images
+    if aligned_images_future is not None:
+        extra_images = aligned_images_future.result()
         for key, value in extra_images.items():
             sdata.images[key] = value
 
@@ -359,34 +381,46 @@ def xenium(
 
 def _decode_cell_id_column(cell_id_column: pd.Series) -> pd.Series:
     if isinstance(cell_id_column.iloc[0], bytes):
-        return cell_id_column.apply(lambda x: x.decode("utf-8"))
+        # decode all the cell ids at once with pyarrow instead of calling a Python function for each of them
+        decoded = pc.cast(pa.array(cell_id_column.to_numpy(), type=pa.binary()), pa.string())
+        return pd.Series(decoded.to_numpy(zero_copy_only=False), index=cell_id_column.index, name=cell_id_column.name)
     return cell_id_column
 
 
-def _get_polygons(
-    path: Path, file: str, specs: dict[str, Any], n_jobs: int, idx: Optional[ArrayLike] = None
-) -> GeoDataFrame:
-    def _poly(arr: ArrayLike) -> Polygon:
-        return Polygon(arr[:-1])
-
+def _get_polygons(path: Path, file: str, specs: dict[str, Any], idx: Optional[ArrayLike] = None) -> GeoDataFrame:
     # seems to be faster than pd.read_parquet
-    df = pq.read_table(path / file).to_pandas()
-
-    group_by = df.groupby(XeniumKeys.CELL_ID)
-    index = pd.Series(group_by.indices.keys())
-    index = _decode_cell_id_column(index)
-    out = Parallel(n_jobs=n_jobs)(
-        delayed(_poly)(i.to_numpy())
-        for _, i in group_by[[XeniumKeys.BOUNDARIES_VERTEX_X, XeniumKeys.BOUNDARIES_VERTEX_Y]]
+    table = pq.read_table(
+        path / file, columns=[XeniumKeys.CELL_ID, XeniumKeys.BOUNDARIES_VERTEX_X, XeniumKeys.BOUNDARIES_VERTEX_Y]
     )
+    # sort the vertices by cell id with pyarrow; the sort is stable, so the order of the vertices within each polygon is
+    # preserved
+    table = table.sort_by(XeniumKeys.CELL_ID)
+    cell_ids = table.column(XeniumKeys.CELL_ID).to_numpy()
+    x = table.column(XeniumKeys.BOUNDARIES_VERTEX_X).to_numpy()
+    y = table.column(XeniumKeys.BOUNDARIES_VERTEX_Y).to_numpy()
+
+    # since the cell ids are sorted, each polygon starts where the cell id changes
+    starts = np.flatnonzero(np.concatenate([[True], cell_ids[1:] != cell_ids[:-1]]))
+    counts = np.diff(np.append(starts, len(cell_ids)))
+    unique_ids = cell_ids[starts]
+    # the last vertex of each polygon is the same as the first one; shapely closes the rings automatically
+    keep = np.ones(len(cell_ids), dtype=bool)
+    keep[starts + counts - 1] = False
+    ring_indices = np.repeat(np.arange(len(unique_ids)), counts - 1)
+    coords = np.stack([x, y], axis=1)[keep]
+    # build all the polygons in a single vectorized call instead of one Python call per polygon
+    out = shapely.polygons(shapely.linearrings(coords, indices=ring_indices))
+
+    index = pd.Series(unique_ids)
+    index = _decode_cell_id_column(index)
     geo_df = GeoDataFrame({"geometry": out})
     version = _parse_version_of_xenium_analyzer(specs)
     if version is not None and version < packaging.version.parse("2.0.0"):
         assert idx is not None
         assert len(idx) == len(geo_df)
         assert np.unique(geo_df.index).size == len(geo_df)
-        assert index.equals(idx)
-        geo_df.index = idx
+        assert np.array_equal(index.to_numpy(), idx)
+        geo_df.index = pd.Index(idx, copy=False, name=str(XeniumKeys.CELL_ID))
     else:
         geo_df.index = index
         if not np.unique(geo_df.index).size == len(geo_df):
@@ -400,10 +434,41 @@ def _get_polygons(
     return ShapesModel.parse(geo_df, transformations={"global": scale})
 
 
-def _get_labels_and_indices_mapping(
+def _get_labels(
     path: Path,
     file: str,
     specs: dict[str, Any],
+    nucleus_labels: bool,
+    cells_labels: bool,
+    labels_models_kwargs: Mapping[str, Any] = MappingProxyType({}),
+) -> tuple[dict[str, DataArray | DataTree], pd.DataFrame | None]:
+    labels = {}
+    cell_labels_indices_mapping = None
+    # read the zarr directly from the zip file, only the arrays that are accessed are decompressed; the store is opened
+    # once and shared between the nucleus and the cell labels
+    with zarr.open_group(zarr.ZipStore(str(path / file), mode="r"), mode="r") as z:
+        if nucleus_labels:
+            labels["nucleus_labels"], _ = _get_labels_and_indices_mapping(
+                z,
+                specs,
+                mask_index=0,
+                labels_name="nucleus_labels",
+                labels_models_kwargs=labels_models_kwargs,
+            )
+        if cells_labels:
+            labels["cell_labels"], cell_labels_indices_mapping = _get_labels_and_indices_mapping(
+                z,
+                specs,
+                mask_index=1,
+                labels_name="cell_labels",
+                labels_models_kwargs=labels_models_kwargs,
+            )
+    return labels, cell_labels_indices_mapping
+
+
+def _get_labels_and_indices_mapping(
+    z: zarr.Group,
+    specs: dict[str, Any],
     mask_index: int,
     labels_name: str,
     labels_models_kwargs: Mapping[str, Any] = MappingProxyType({}),
@@ -411,65 +476,56 @@ def _get_labels_and_indices_mapping(
     if mask_index not in [0, 1]:
         raise ValueError(f"mask_index must be 0 or 1, found {mask_index}.")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        zip_file = path / XeniumKeys.CELLS_ZARR
-        with zipfile.ZipFile(zip_file, "r") as zip_ref:
-            zip_ref.extractall(tmpdir)
+    # get the labels
+    masks = z["masks"][f"{mask_index}"][...]
+    labels = Labels2DModel.parse(masks, dims=("y", "x"), transformations={"global": Identity()}, **labels_models_kwargs)
 
-        with zarr.open(str(tmpdir), mode="r") as z:
-            # get the labels
-            masks = z["masks"][f"{mask_index}"][...]
-            labels = Labels2DModel.parse(
-                masks, dims=("y", "x"), transformations={"global": Identity()}, **labels_models_kwargs
+    # build the matching table
+    version = _parse_version_of_xenium_analyzer(specs)
+    if mask_index == 0:
+        # nuclei currently not supported
+        return labels, None
+    if version is None or version is not None and version < packaging.version.parse("1.3.0"):
+        # supported in version 1.3.0 and not supported in version 1.0.2; conservatively, let's assume it is not
+        # supported in versions < 1.3.0
+        return labels, None
+
+    cell_id, dataset_suffix = z["cell_id"][...].T
+    cell_id_str = cell_id_str_from_prefix_suffix_uint32(cell_id, dataset_suffix)
+
+    # this information will probably be available in the `label_id` column for version > 2.0.0 (see public
+    # release notes mentioned above)
+    real_label_index = get_element_instances(labels).values
+
+    # background removal
+    if real_label_index[0] == 0:
+        real_label_index = real_label_index[1:]
+
+    if version < packaging.version.parse("2.0.0"):
+        expected_label_index = z["seg_mask_value"][...]
+
+        if not np.array_equal(expected_label_index, real_label_index):
+            raise ValueError(
+                "The label indices from the labels differ from the ones from the input data. Please report "
+                f"this issue. Real label indices: {real_label_index}, expected label indices: "
+                f"{expected_label_index}."
             )
-
-            # build the matching table
-            version = _parse_version_of_xenium_analyzer(specs)
-            if mask_index == 0:
-                # nuclei currently not supported
-                return labels, None
-            if version is None or version is not None and version < packaging.version.parse("1.3.0"):
-                # supported in version 1.3.0 and not supported in version 1.0.2; conservatively, let's assume it is not
-                # supported in versions < 1.3.0
-                return labels, None
-
-            cell_id, dataset_suffix = z["cell_id"][...].T
-            cell_id_str = cell_id_str_from_prefix_suffix_uint32(cell_id, dataset_suffix)
-
-            # this information will probably be available in the `label_id` column for version > 2.0.0 (see public
-            # release notes mentioned above)
-            real_label_index = get_element_instances(labels).values
-
-            # background removal
-            if real_label_index[0] == 0:
-                real_label_index = real_label_index[1:]
-
-            if version < packaging.version.parse("2.0.0"):
-                expected_label_index = z["seg_mask_value"][...]
-
-                if not np.array_equal(expected_label_index, real_label_index):
-                    raise ValueError(
-                        "The label indices from the labels differ from the ones from the input data. Please report "
-                        f"this issue. Real label indices: {real_label_index}, expected label indices: "
-                        f"{expected_label_index}."
-                    )
-            else:
-                labels_positional_indices = z["polygon_sets"][mask_index]["cell_index"][...]
-                if not np.array_equal(labels_positional_indices, np.arange(len(labels_positional_indices))):
-                    raise ValueError(
-                        "The positional indices of the labels do not match the expected range. Please report this "
-                        "issue."
-                    )
-
-            # labels_index is an uint32, so let's cast to np.int64 to avoid the risk of overflow on some systems
-            indices_mapping = pd.DataFrame(
-                {
-                    "region": labels_name,
-                    "cell_id": cell_id_str,
-                    "label_index": real_label_index.astype(np.int64),
-                }
+    else:
+        labels_positional_indices = z["polygon_sets"][mask_index]["cell_index"][...]
+        if not np.array_equal(labels_positional_indices, np.arange(len(labels_positional_indices))):
+            raise ValueError(
+                "The positional indices of the labels do not match the expected range. Please report this issue."
             )
-            return labels, indices_mapping
+
+    # labels_index is an uint32, so let's cast to np.int64 to avoid the risk of overflow on some systems
+    indices_mapping = pd.DataFrame(
+        {
+            "region": labels_name,
+            "cell_id": cell_id_str,
+            "label_index": real_label_index.astype(np.int64),
+        }
+    )
+    return labels, indices_mapping
 
 
 @inject_docs(xx=XeniumKeys)
@@ -485,27 +541,34 @@ def _get_cells_metadata_table_from_zarr(
     nucleus_count for versions >= 2.0.0.
     """
     # for version >= 2.0.0, in this function we could also parse the segmentation method used to obtain the masks
-    with tempfile.TemporaryDirectory() as tmpdir:
-        zip_file = path / XeniumKeys.CELLS_ZARR
-        with zipfile.ZipFile(zip_file, "r") as zip_ref:
-            zip_ref.extractall(tmpdir)
-
-        with zarr.open(str(tmpdir), mode="r") as z:
-            x = z["cell_summary"][...]
-            column_names = z["cell_summary"].attrs["column_names"]
-            df = pd.DataFrame(x, columns=column_names)
-            cell_id_prefix = z["cell_id"][:, 0]
-            dataset_suffix = z["cell_id"][:, 1]
-
-            cell_id_str = cell_id_str_from_prefix_suffix_uint32(cell_id_prefix, dataset_suffix)
-            df[XeniumKeys.CELL_ID] = cell_id_str
-            return df
+    with zarr.open_group(zarr.ZipStore(str(path / file), mode="r"), mode="r") as z:
+        x = z["cell_summary"][...]
+        column_names = z["cell_summary"].attrs["column_names"]
+        df = pd.DataFrame(x, columns=column_names)
+        cell_id_prefix = z["cell_id"][:, 0]
+        dataset_suffix = z["cell_id"][:, 1]
+
+        cell_id_str = cell_id_str_from_prefix_suffix_uint32(cell_id_prefix, dataset_suffix)
+        df[XeniumKeys.CELL_ID] = cell_id_str
+        return df
+
+
+def _decode_feature_name_column(feature_name_column: pd.Series) -> pd.Series:
+    # decode the whole partition with pyarrow instead of calling a Python function for each transcript
+    array = pa.array(feature_name_column, from_pandas=True)
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if not pa.types.is_string(array.type):
+        array = pc.cast(array, pa.string())
+    return pd.Series(
+        array.to_numpy(zero_copy_only=False), index=feature_name_column.index, name=feature_name_column.name
+    )
 
 
 def _get_points(path: Path, specs: dict[str, Any]) -> Table:
     table = read_parquet(path / XeniumKeys.TRANSCRIPTS_FILE)
-    table["feature_name"] = table["feature_name"].apply(
-        lambda x: x.decode("utf-8") if isinstance(x, bytes) else str(x), meta=("feature_name", "object")
+    table["feature_name"] = table["feature_name"].map_partitions(
+        _decode_feature_name_column, meta=("feature_name", "object")
     )
 
     transform = Scale([1.0 / specs["pixel_size"], 1.0 / specs["pixel_size"]], axes=("x", "y"))
@@ -524,15 +587,26 @@ def _get_tables_and_circles(
     path: Path, cells_as_circles: bool, specs: dict[str, Any]
 ) -> AnnData | tuple[AnnData, AnnData]:
     adata = _read_10x_h5(path / XeniumKeys.CELL_FEATURE_MATRIX_FILE)
-    metadata = pd.read_parquet(path / XeniumKeys.CELL_METADATA_FILE)
-    np.testing.assert_array_equal(metadata.cell_id.astype(str), adata.obs_names.values)
-    circ = metadata[[XeniumKeys.CELL_X, XeniumKeys.CELL_Y]].to_numpy()
+    metadata = pq.read_table(path / XeniumKeys.CELL_METADATA_FILE)
+    # decode the cell ids once with pyarrow, and compare them without boxing each of them into a Python object
+    cell_id_column = metadata.column(XeniumKeys.CELL_ID)
+    cell_id = pc.cast(cell_id_column, pa.string())
+    assert len(cell_id) == adata.n_obs and pc.all(pc.equal(cell_id, pa.array(adata.obs_names.values))).as_py(), (
+        f"The cell ids in {XeniumKeys.CELL_METADATA_FILE} do not match the ones in "
+        f"{XeniumKeys.CELL_FEATURE_MATRIX_FILE}."
+    )
+    circ = np.stack(
+        [metadata.column(XeniumKeys.CELL_X).to_numpy(), metadata.column(XeniumKeys.CELL_Y).to_numpy()], axis=1
+    )
     adata.obsm["spatial"] = circ
-    metadata.drop([XeniumKeys.CELL_X, XeniumKeys.CELL_Y], axis=1, inplace=True)
-    adata.obs = metadata
+    if pa.types.is_binary(cell_id_column.type) or pa.types.is_large_binary(cell_id_column.type):
+        # reuse the decoded cell ids; integer cell ids (old versions) are kept as they are
+        metadata = metadata.set_column(metadata.schema.get_field_index(XeniumKeys.CELL_ID), XeniumKeys.CELL_ID, cell_id)
+    adata.obs = metadata.select(
+        [name for name in metadata.column_names if name not in [XeniumKeys.CELL_X, XeniumKeys.CELL_Y]]
+    ).to_pandas()
     adata.obs["region"] = specs["region"]
     adata.obs["region"] = adata.obs["region"].astype("category")
-    adata.obs[XeniumKeys.CELL_ID] = _decode_cell_id_column(adata.obs[XeniumKeys.CELL_ID])
     table = TableModel.parse(adata, region=specs["region"], region_key="region", instance_key=str(XeniumKeys.CELL_ID))
     if cells_as_circles:
         transform = Scale([1.0 / specs["pixel_size"], 1.0 / specs["pixel_size"]], axes=("x", "y"))
@@ -542,30 +616,192 @@ def _get_tables_and_circles(
             geometry=0,
             radius=radii,
             transformations={"global": transform},
-            index=adata.obs[XeniumKeys.CELL_ID].copy(),
+            index=adata.obs[XeniumKeys.CELL_ID],
         )
         return table, circles
     return table
 
 
+class _IgnoreMultiFilePyramidWarning(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Ignore specific log message
+        return "OME series cannot read multi-file pyramids" not in record.getMessage()
+
+
+_TIFFFILE_FILTER_INSTALLED = False
+
+
+def _install_tifffile_filter() -> None:
+    """Install the filter for the tifffile multi-file pyramids warning, only once since the logger is global."""
+    global _TIFFFILE_FILTER_INSTALLED
+    if not _TIFFFILE_FILTER_INSTALLED:
+        tifffile.logger().addFilter(_IgnoreMultiFilePyramidWarning())
+        _TIFFFILE_FILTER_INSTALLED = True
+
+
+def _read_tiff_level(path: Path, level: int, **kwargs: Any) -> da.Array:
+    """Lazily read a resolution level of a TIFF image, with one chunk per tile."""
+    z = zarr.open(tifffile.imread(path, aszarr=True, level=level, **kwargs), mode="r")
+    # not using da.from_zarr() since spatialdata would then treat the TIFF as a zarr store backing the data
+    return da.from_array(z, chunks=z.chunks)
+
+
+def _imread_tiled(path: Path, imread_kwargs: Mapping[str, Any] = MappingProxyType({})) -> da.Array:
+    """
+    Lazily read a TIFF image, using the tiles of the file as chunks.
+
+    `dask_image.imread.imread()` loads each page as a single chunk, which for large morphology images means loading
+    the whole image in memory; it is used as a fallback when the file is not tiled or when `imread_kwargs` are passed.
+    """
+    if not imread_kwargs:
+        with tifffile.TiffFile(path) as tif:
+            keyframe = tif.series[0].keyframe
+            is_tiled = keyframe.is_tiled
+            page_shape = keyframe.shape
+        if is_tiled:
+            image = _read_tiff_level(path, level=0)
+            # same layout as dask_image.imread.imread(): the pages are stacked along the first axis
+            return image.reshape((-1,) + page_shape)
+    return imread(path, **imread_kwargs)
+
+
 def _get_images(
     path: Path,
-    file: str,
+    file: str | list[str],
     imread_kwargs: Mapping[str, Any] = MappingProxyType({}),
     image_models_kwargs: Mapping[str, Any] = MappingProxyType({}),
 ) -> DataArray | DataTree:
-    image = imread(path / file, **imread_kwargs)
+    # a list of files is a multi-file OME-TIFF with one file per channel, as for the morphology focus images
+    files = [file] if isinstance(file, str) else file
+    levels = []
+    scale_factors = image_models_kwargs.get("scale_factors")
+    # when the files already contain the requested pyramid, let's use it instead of recomputing the lower resolution
+    # levels; otherwise the pyramid is computed from the full resolution image
+    method = image_models_kwargs.get("method")
+    if not imread_kwargs and len(files) > 1:
+        levels = _read_tiff_channel_files_levels(
+            [path / f for f in files], scale_factors=scale_factors if method is None else None
+        )
+    elif not imread_kwargs and scale_factors is not None and method is None:
+        levels = _read_tiff_pyramid_levels(path / files[0], scale_factors)
+    if len(levels) == 0:
+        # for multi-file OME-TIFFs, reading the first file gives all the channels
+        levels = [_imread_tiled(path / files[0], imread_kwargs)]
     if "c_coords" in image_models_kwargs and "dummy" in image_models_kwargs["c_coords"]:
         # Napari currently interprets 4 channel images as RGB; a series of PRs to fix this is almost ready but they will
         # not be merged soon.
         # Here, since the new data from the xenium analyzer version 2.0.0 gives 4-channel images that are not RGBA,
         # let's add a dummy channel as a temporary workaround.
-        image = da.concatenate([image, da.zeros_like(image[0:1])], axis=0)
+        levels = [_add_dummy_channel(level) for level in levels]
+    if len(levels) > 1:
+        return _get_multiscale_image_from_levels(levels, image_models_kwargs)
     return Image2DModel.parse(
-        image, transformations={"global": Identity()}, dims=("c", "y", "x"), rgb=None, **image_models_kwargs
+        levels[0], transformations={"global": Identity()}, dims=("c", "y", "x"), rgb=None, **image_models_kwargs
     )
 
 
+def _read_tiff_pyramid_levels(path: Path, scale_factors: Sequence[int | Mapping[str, int]]) -> list[da.Array]:
+    """
+    Lazily read the resolution levels of a pyramidal (c)yx TIFF matching the scale factors, as (c, y, x) arrays.
+
+    The result is empty if the file does not contain all the requested levels.
+    """
+    with tifffile.TiffFile(path) as tif:
+        series = tif.series[0]
+        if series.axes not in ["YX", "CYX"]:
+            return []
+        # the levels are chosen from their shape, so that only the ones that are used are opened
+        indices = _select_pyramid_levels([level.shape for level in series.levels], scale_factors)
+    levels = [_read_tiff_level(path, level=i) for i in indices]
+    return [level[np.newaxis] if level.ndim == 2 else level for level in levels]
+
+
+def _select_pyramid_levels(
+    shapes: Sequence[tuple[int, ...]], scale_factors: Sequence[int | Mapping[str, int]]
+) -> list[int]:
+    """
+    Select the indices of the precomputed resolution levels matching the scale factors, relative to the previous level.
+
+    Levels are matched by their (y, x) shape, rounding down or up. The result is empty if one of the requested levels is
+    not available, so that the pyramid is computed from the full resolution level instead.
+    """
+    if len(shapes) < 2 or len(scale_factors) == 0:
+        return []
+    selected = [0]
+    for factor in scale_factors:
+        factors = (factor.get("y", 1), factor.get("x", 1)) if isinstance(factor, Mapping) else (factor, factor)
+        expected = [{n // f, -(-n // f)} for n, f in zip(shapes[selected[-1]][-2:], factors)]
+        matches = [i for i, shape in enumerate(shapes) if all(n in e for n, e in zip(shape[-2:], expected))]
+        if len(matches) == 0:
+            return []
+        selected.append(matches[0])
+    return selected
+
+
+def _read_tiff_channel_files_levels(
+    paths: list[Path], scale_factors: Sequence[int | Mapping[str, int]] | None = None
+) -> list[da.Array]:
+    """
+    Lazily read single-channel TIFF files, one per channel, as (c, y, x) resolution levels.
+
+    Each file is read on its own rather than as part of the multi-file OME series: this way each file is opened once
+    and the tiles are used as chunks, and the pyramid stored in each file is available (tifffile cannot read multi-file
+    OME pyramids). The levels matching `scale_factors` are read; only the full resolution level is read if
+    `scale_factors` is None or if the files do not contain all the requested levels. The result is empty if the files
+    are not single-channel images with matching levels.
+    """
+    levels_shapes = []
+    for p in paths:
+        with tifffile.TiffFile(p, is_ome=False) as tif:
+            series = tif.series[0]
+            if series.axes != "YX":
+                return []
+            levels_shapes.append([(level.shape, level.dtype) for level in series.levels])
+    n_levels = min(len(shapes) for shapes in levels_shapes) if scale_factors is not None else 1
+    if any(shapes[:n_levels] != levels_shapes[0][:n_levels] for shapes in levels_shapes):
+        return []
+    indices = []
+    if scale_factors is not None:
+        # the levels are chosen from their shape, so that only the ones that are used are opened
+        indices = _select_pyramid_levels([shape for shape, _ in levels_shapes[0][:n_levels]], scale_factors)
+    return [da.stack([_read_tiff_level(p, level=i, is_ome=False) for p in paths]) for i in indices or [0]]
+
+
+def _get_multiscale_image_from_levels(
+    levels: list[da.Array], image_models_kwargs: Mapping[str, Any] = MappingProxyType({})
+) -> DataTree:
+    """Build a multiscale image from precomputed (c, y, x) resolution levels, ordered from the highest resolution."""
+    image_models_kwargs = dict(image_models_kwargs)
+    image_models_kwargs.pop("scale_factors", None)
+    image_models_kwargs.pop("method", None)
+    chunks = image_models_kwargs.pop("chunks", None)
+    if chunks is not None:
+        levels = [level.rechunk(chunks) for level in levels]
+    scale0 = Image2DModel.parse(levels[0], dims=("c", "y", "x"), rgb=None, **image_models_kwargs)
+    data = {"scale0": scale0}
+    for i, level in enumerate(levels[1:], start=1):
+        data[f"scale{i}"] = DataArray(level, dims=scale0.dims, coords={"c": scale0.coords["c"]}, name=scale0.name)
+    image = DataTree.from_dict({name: level.to_dataset() for name, level in data.items()})
+    # the transformations of the lower resolution levels are derived from their shape
+    set_transformation(image, {"global": Identity()}, set_all=True)
+    return compute_coordinates(image)
+
+
+def _add_dummy_channel(image: da.Array) -> da.Array:
+    """Append a channel of zeros to a (c, y, x) image, generating it inside the blocks of the last channel chunk."""
+
+    def _pad_block(block: ArrayLike, block_info: dict[Any, Any] | None = None) -> ArrayLike:
+        assert block_info is not None
+        if block_info[None]["chunk-location"][0] < block_info[None]["num-chunks"][0] - 1:
+            return block
+        padded = np.zeros((block.shape[0] + 1,) + block.shape[1:], dtype=block.dtype)
+        padded[:-1] = block
+        return padded
+
+    chunks = (image.chunks[0][:-1] + (image.chunks[0][-1] + 1,),) + image.chunks[1:]
+    return image.map_blocks(_pad_block, chunks=chunks, dtype=image.dtype)
+
+
 def _add_aligned_images(
     path: Path,
     imread_kwargs: Mapping[str, Any] = MappingProxyType({}),
@@ -573,8 +809,15 @@ def _add_aligned_images(
 ) -> dict[str, DataTree]:
     """Discover and parse aligned images."""
     images = {}
-    ome_tif_files = list(path.glob("*.ome.tif"))
-    csv_files = list(path.glob("*.csv"))
+    # a single pass over the directory, finding the same files as path.glob("*.ome.tif") and path.glob("*.csv")
+    ome_tif_files = []
+    csv_files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.endswith(".ome.tif"):
+                ome_tif_files.append(path / entry.name)
+            elif entry.name.endswith(".csv"):
+                csv_files.append(path / entry.name)
     for file in ome_tif_files:
         element_name = None
         for suffix in [XeniumKeys.ALIGNED_HE_IMAGE_SUFFIX, XeniumKeys.ALIGNED_IF_IMAGE_SUFFIX]:
@@ -627,31 +870,14 @@ def xenium_aligned_image(
     """
     image_path = Path(image_path)
     assert image_path.exists(), f"File {image_path} does not exist."
-    image = imread(image_path, **imread_kwargs)
-
-    # Depending on the version of pipeline that was used, some images have shape (1, y, x, 3) and others (3, y, x) or
-    # (4, y, x).
-    # since y and x are always different from 1, let's differentiate from the two cases here, independently of the
-    # pipeline version.
-    # Note that a more robust approach is to look at the xml metadata in the ome.tif; we should use this in a future PR.
-    # In fact, it could be that the len(image.shape) == 4 has actually dimes (1, x, y, c) and not (1, y, x, c). This is
-    # not a problem because the transformation is constructed to be consistent, but if is the case, the data orientation
-    # would be transposed compared to the original image, not ideal.
     if dims is None:
-        if len(image.shape) == 4:
-            assert image.shape[0] == 1
-            assert image.shape[-1] == 3
-            image = image.squeeze(0)
-            dims = ("y", "x", "c")
-        else:
-            assert len(image.shape) == 3
-            assert image.shape[0] in [3, 4]
-            if image.shape[0] == 4:
-                # as explained before in _get_images(), we need to add a dummy channel until we support 4-channel images as
-                # non-RGBA images in napari
-                image = da.concatenate([image, da.zeros_like(image[0:1])], axis=0)
-            dims = ("c", "y", "x")
+        image, dims = _read_aligned_image(image_path, imread_kwargs)
+        if dims == ("c", "y", "x") and image.shape[0] == 4:
+            # as explained before in _get_images(), we need to add a dummy channel until we support 4-channel images as
+            # non-RGBA images in napari
+            image = _add_dummy_channel(image)
     else:
+        image = imread(image_path, **imread_kwargs)
         logging.info(f"Image has shape {image.shape}, parsing with dims={dims}.")
         image = DataArray(image, dims=dims)
         # squeeze spurious dimensions away
@@ -665,7 +891,7 @@ def xenium_aligned_image(
     else:
         alignment_file = Path(alignment_file)
         assert alignment_file.exists(), f"File {alignment_file} does not exist."
-        alignment = pd.read_csv(alignment_file, header=None).values
+        alignment = np.loadtxt(alignment_file, delimiter=",", dtype=np.float64)
         transformation = Affine(alignment, input_axes=("x", "y"), output_axes=("x", "y"))
 
     return Image2DModel.parse(
@@ -676,9 +902,37 @@ def xenium_aligned_image(
     )
 
 
-def _selection_to_polygon(df: pd.DataFrame, pixel_size: float) -> Polygon:
-    xy_keys = [XeniumKeys.EXPLORER_SELECTION_X, XeniumKeys.EXPLORER_SELECTION_Y]
-    return Polygon(df[xy_keys].values / pixel_size)
+def _read_aligned_image(
+    image_path: Path, imread_kwargs: Mapping[str, Any] = MappingProxyType({})
+) -> tuple[da.Array, tuple[str, ...]]:
+    """Read an aligned image and infer its dimensions, either (y, x, c) for RGB images or (c, y, x)."""
+    if not imread_kwargs:
+        # the axes in the TIFF metadata give the layout of the image, without building a dask graph to look at its shape
+        with tifffile.TiffFile(image_path) as tif:
+            series = tif.series[0]
+            dims = _TIFF_AXES_TO_DIMS.get(series.axes)
+            is_tiled = series.keyframe.is_tiled
+        if dims is not None and is_tiled:
+            image = _read_tiff_level(image_path, level=0)
+            assert image.shape[dims.index("c")] in ([3, 4] if dims[0] == "c" else [3])
+            return image, dims
+
+    image = imread(image_path, **imread_kwargs)
+    # Depending on the version of pipeline that was used, some images have shape (1, y, x, 3) and others (3, y, x) or
+    # (4, y, x).
+    # since y and x are always different from 1, let's differentiate from the two cases here, independently of the
+    # pipeline version.
+    # Note that this is only used when the axes cannot be read from the TIFF metadata. In fact, it could be that the
+    # len(image.shape) == 4 has actually dimes (1, x, y, c) and not (1, y, x, c). This is not a problem because the
+    # transformation is constructed to be consistent, but if is the case, the data orientation would be transposed
+    # compared to the original image, not ideal.
+    if len(image.shape) == 4:
+        assert image.shape[0] == 1
+        assert image.shape[-1] == 3
+        return image.squeeze(0), ("y", "x", "c")
+    assert len(image.shape) == 3
+    assert image.shape[0] in [3, 4]
+    return image, ("c", "y", "x")
 
 
 def xenium_explorer_selection(
@@ -707,13 +961,28 @@ def xenium_explorer_selection(
     -------
     :class:`shapely.geometry.polygon.Polygon`
     """
-    df = pd.read_csv(path, skiprows=2)
-
-    if XeniumKeys.EXPLORER_SELECTION_KEY not in df:
-        polygon = _selection_to_polygon(df, pixel_size)
+    with open(path, encoding="utf-8", newline="") as f:
+        # the first two lines are comments, the third one is the header, which may be quoted
+        header = [f.readline() for _ in range(3)][-1]
+    columns = [column.strip() for column in next(csv.reader([header]))]
+    xy_columns = [columns.index(XeniumKeys.EXPLORER_SELECTION_X), columns.index(XeniumKeys.EXPLORER_SELECTION_Y)]
+    coords = np.loadtxt(path, delimiter=",", quotechar='"', skiprows=3, usecols=xy_columns, dtype=np.float64, ndmin=2)
+    coords /= pixel_size
+
+    if XeniumKeys.EXPLORER_SELECTION_KEY not in columns:
+        polygon = Polygon(coords)
         return [polygon] if return_list else polygon
 
-    return [_selection_to_polygon(sub_df, pixel_size) for _, sub_df in df.groupby(XeniumKeys.EXPLORER_SELECTION_KEY)]
+    selection = np.loadtxt(
+        path,
+        delimiter=",",
+        quotechar='"',
+        skiprows=3,
+        usecols=columns.index(XeniumKeys.EXPLORER_SELECTION_KEY),
+        dtype=str,
+        ndmin=1,
+    )
+    return [Polygon(coords[selection == key]) for key in np.unique(selection)]
 
 
 def _parse_version_of_xenium_analyzer(
@@ -721,31 +990,34 @@ def _parse_version_of_xenium_analyzer(
     hide_warning: bool = True,
 ) -> packaging.version.Version | None:
     string = specs[XeniumKeys.ANALYSIS_SW_VERSION]
-    pattern = r"^(?:x|X)enium-(\d+\.\d+\.\d+(\.\d+-\d+)?)"
-
-    result = re.search(pattern, string)
-    # Example
-    # Input: xenium-2.0.0.6-35-ga7e17149a
-    # Output: 2.0.0.6-35
-
-    warning_message = (
-        f"Could not parse the version of the Xenium Analyzer from the string: {string}. This may happen for "
-        "experimental version of the data. Please report in GitHub https://github.com/scverse/spatialdata-io/issues.\n"
-        "The reader will continue assuming the latest version of the Xenium Analyzer."
-    )
-
-    if result is None:
-        if not hide_warning:
-            warnings.warn(warning_message, stacklevel=2)
-        return None
-
-    group = result.groups()[0]
-    try:
-        return packaging.version.parse(group)
-    except packaging.version.InvalidVersion:
-        if not hide_warning:
-            warnings.warn(warning_message, stacklevel=2)
-        return None
+    # the version is parsed once and then cached in the specs, since the readers of the single elements also need it
+    version: packaging.version.Version | None
+    if _PARSED_VERSION_KEY in specs:
+        version = specs[_PARSED_VERSION_KEY]
+    else:
+        result = _XENIUM_ANALYZER_VERSION_PATTERN.search(string)
+        # Example
+        # Input: xenium-2.0.0.6-35-ga7e17149a
+        # Output: 2.0.0.6-35
+
+        version = None
+        if result is not None:
+            group = result.groups()[0]
+            try:
+                version = packaging.version.parse(group)
+            except packaging.version.InvalidVersion:
+                pass
+        specs[_PARSED_VERSION_KEY] = version
+
+    if version is None and not hide_warning:
+        warnings.warn(
+            f"Could not parse the version of the Xenium Analyzer from the string: {string}. This may happen for "
+            "experimental version of the data. Please report in GitHub "
+            "https://github.com/scverse/spatialdata-io/issues.\n"
+            "The reader will continue assuming the latest version of the Xenium Analyzer.",
+            stacklevel=2,
+        )
+    return version
 
 
 def cell_id_str_from_prefix_suffix_uint32(cell_id_prefix: ArrayLike, dataset_suffix: ArrayLike) -> ArrayLike:
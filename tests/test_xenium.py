@@ -1,14 +1,35 @@
+import json
 import math
 import sys
+import warnings
 from pathlib import Path
+from typing import Any, Optional
 
+import dask.array as da
+import h5py
 import numpy as np
+import packaging.version
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
+import scipy.sparse
+import shapely
+import tifffile
+from multiscale_spatial_image.to_multiscale.to_multiscale import Methods
 
+from spatialdata_io.readers import xenium as xenium_module
 from spatialdata_io.readers.xenium import (
+    _PARSED_VERSION_KEY,
+    _add_dummy_channel,
+    _get_images,
+    _get_polygons,
+    _parse_version_of_xenium_analyzer,
     cell_id_str_from_prefix_suffix_uint32,
     prefix_suffix_uint32_from_cell_id_str,
     xenium,
+    xenium_aligned_image,
+    xenium_explorer_selection,
 )
 
 
@@ -40,6 +61,385 @@ def test_roundtrip_with_data_limits() -> None:
     assert np.array_equal(cell_id_str, f0(*f1(cell_id_str)))
 
 
+def _write_pyramidal_tiff(path: Path, seed: int = 0) -> list[np.ndarray]:
+    # the lower resolution levels are random, so that they can be told apart from levels computed by downsampling
+    rng = np.random.default_rng(seed)
+    levels = [rng.integers(0, 255, size=(256 // 2**i, 256 // 2**i), dtype=np.uint8) for i in range(3)]
+    with tifffile.TiffWriter(path) as tif:
+        tif.write(levels[0], tile=(64, 64), subifds=2)
+        for level in levels[1:]:
+            tif.write(level, tile=(32, 32), subfiletype=1)
+    return levels
+
+
+@pytest.mark.parametrize("quoted", [False, True])
+def test_xenium_explorer_selection(tmp_path: Path, quoted: bool) -> None:
+    header = '"X","Y"' if quoted else "X,Y"
+    path = tmp_path / "selection.csv"
+    path.write_text(
+        f"#Selection name: Selection 1\n#Area (µm^2): 4.00\n{header}\n0,0\n2.125,0\n2.125,4.25\n", encoding="utf-8"
+    )
+
+    polygon = xenium_explorer_selection(path, pixel_size=2.125)
+    assert shapely.equals_exact(polygon, shapely.Polygon([(0, 0), (1, 0), (1, 2)]), tolerance=0)
+    assert xenium_explorer_selection(path, pixel_size=2.125, return_list=True) == [polygon]
+
+
+@pytest.mark.parametrize("quoted", [False, True])
+def test_xenium_explorer_selection_multiple(tmp_path: Path, quoted: bool) -> None:
+    header = '"Selection","X","Y"' if quoted else "Selection,X,Y"
+    rows = [
+        ("Selection 2", 0, 0),
+        ("Selection 2", 1, 0),
+        ("Selection 2", 1, 1),
+        ("Selection 1", 5, 5),
+        ("Selection 1", 6, 5),
+        ("Selection 1", 6, 7),
+        ("Selection 1", 5, 7),
+    ]
+    lines = [f'"{name}",{x},{y}' if quoted else f"{name},{x},{y}" for name, x, y in rows]
+    path = tmp_path / "selection.csv"
+    path.write_text("\n".join(["#Selection name: multiple", "#Area (µm^2): 2.50", header] + lines), encoding="utf-8")
+
+    polygons = xenium_explorer_selection(path, pixel_size=1.0)
+    # the polygons are sorted by the selection name
+    expected = [
+        shapely.Polygon([(5, 5), (6, 5), (6, 7), (5, 7)]),
+        shapely.Polygon([(0, 0), (1, 0), (1, 1)]),
+    ]
+    assert len(polygons) == len(expected)
+    for polygon, expected_polygon in zip(polygons, expected):
+        assert shapely.equals_exact(polygon, expected_polygon, tolerance=0)
+
+
+@pytest.mark.parametrize("imread_kwargs", [{}, {"nframes": 1}])
+@pytest.mark.parametrize("tiled", [True, False])
+@pytest.mark.parametrize("axes", ["YXS", "CYX"])
+def test_xenium_aligned_image(tmp_path: Path, axes: str, tiled: bool, imread_kwargs: dict[str, Any]) -> None:
+    rng = np.random.default_rng(0)
+    shape = (64, 96, 3) if axes == "YXS" else (4, 64, 96)
+    data = rng.integers(1, 255, shape, dtype=np.uint8)
+    path = tmp_path / "image.ome.tif"
+    tifffile.imwrite(
+        path,
+        data,
+        photometric="rgb" if axes == "YXS" else "minisblack",
+        tile=(32, 32) if tiled else None,
+        metadata={"axes": axes},
+    )
+    with tifffile.TiffFile(path) as tif:
+        assert tif.series[0].axes == axes
+
+    image = xenium_aligned_image(path, alignment_file=None, imread_kwargs=imread_kwargs)
+    assert image.dims == ("c", "y", "x")
+    # tiled images are read through tifffile with one chunk per tile, the other ones with dask-image
+    expected_chunksize = (32, 32) if tiled and not imread_kwargs else (64, 96)
+    assert image.data.chunksize[1:] == expected_chunksize
+    if axes == "YXS":
+        assert np.array_equal(image.values, data.transpose(2, 0, 1))
+    else:
+        # the 4-channel images get a dummy fifth channel
+        assert image.shape == (5, 64, 96)
+        assert np.array_equal(image.values[:4], data)
+        assert not image.values[4].any()
+
+
+@pytest.fixture
+def pyramidal_tiff(tmp_path: Path) -> tuple[Path, list[np.ndarray]]:
+    path = tmp_path / "image.ome.tif"
+    return path, _write_pyramidal_tiff(path)
+
+
+def test_parse_version_of_xenium_analyzer_is_cached() -> None:
+    specs = {"analysis_sw_version": "xenium-2.0.0.6-35-ga7e17149a"}
+    version = _parse_version_of_xenium_analyzer(specs)
+    assert version == packaging.version.parse("2.0.0.6-35")
+    assert specs[_PARSED_VERSION_KEY] is version
+    specs["analysis_sw_version"] = "xenium-1.0.0"
+    assert _parse_version_of_xenium_analyzer(specs) is version
+
+
+def test_parse_version_of_xenium_analyzer_warning() -> None:
+    specs = {"analysis_sw_version": "unknown"}
+    # the version is cached even when it cannot be parsed, but a later call asking for the warning still gives it
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert _parse_version_of_xenium_analyzer(specs) is None
+    assert specs[_PARSED_VERSION_KEY] is None
+    with pytest.warns(UserWarning, match="Could not parse the version") as record:
+        assert _parse_version_of_xenium_analyzer(specs, hide_warning=False) is None
+    assert len(record) == 1
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert _parse_version_of_xenium_analyzer(specs) is None
+
+
+@pytest.mark.parametrize("channel_chunks", [(4,), (1, 1, 1, 1), (3, 1), (2, 2)])
+def test_add_dummy_channel(channel_chunks: tuple[int, ...]) -> None:
+    data = np.arange(4 * 6 * 5, dtype=np.uint16).reshape(4, 6, 5) + 1
+    image = _add_dummy_channel(da.from_array(data, chunks=(channel_chunks, (3, 3), (5,))))
+    # only the last channel chunk grows, the other ones are untouched
+    assert image.chunks == (channel_chunks[:-1] + (channel_chunks[-1] + 1,), (3, 3), (5,))
+    assert image.dtype == data.dtype
+    result = image.compute()
+    assert result.shape == (5, 6, 5)
+    assert np.array_equal(result[:4], data)
+    assert not result[4].any()
+
+
+@pytest.mark.parametrize("cell_id_type", [pa.string(), pa.binary()])
+def test_get_polygons(tmp_path: Path, cell_id_type: pa.DataType) -> None:
+    rng = np.random.default_rng(0)
+    # the polygons are not sorted by cell id and have different numbers of vertices; the last vertex closes the ring
+    cell_ids = ["ffkpbaba-1", "aaaaaaab-1", "aaaaaaac-1"]
+    vertices = {}
+    for cell_id, n_vertices in zip(cell_ids, [5, 4, 7]):
+        angles = np.sort(rng.uniform(0, 2 * np.pi, n_vertices))
+        ring = np.stack([10 + np.cos(angles), 20 + np.sin(angles)], axis=1) * rng.uniform(1, 5)
+        vertices[cell_id] = np.concatenate([ring, ring[:1]])
+    table = pa.table(
+        {
+            "cell_id": pa.array(
+                [
+                    cell_id.encode() if cell_id_type == pa.binary() else cell_id
+                    for cell_id in cell_ids
+                    for _ in vertices[cell_id]
+                ],
+                type=cell_id_type,
+            ),
+            "vertex_x": np.concatenate([vertices[cell_id][:, 0] for cell_id in cell_ids]),
+            "vertex_y": np.concatenate([vertices[cell_id][:, 1] for cell_id in cell_ids]),
+        }
+    )
+    pq.write_table(table, tmp_path / "cell_boundaries.parquet")
+    specs = {"analysis_sw_version": "xenium-2.0.0.6-35-ga7e17149a", "pixel_size": 0.2125}
+
+    polygons = _get_polygons(tmp_path, "cell_boundaries.parquet", specs)
+    assert polygons.index.tolist() == sorted(cell_ids)
+    for cell_id, polygon in polygons.geometry.items():
+        assert shapely.equals_exact(polygon, shapely.Polygon(vertices[cell_id][:-1]), tolerance=0)
+
+
+@pytest.mark.parametrize(
+    "scale_factors,expected_file_levels,expected_shapes",
+    [
+        ([2], [0, 1], [256, 128]),
+        ([2, 2], [0, 1, 2], [256, 128, 64]),
+        ([4], [0, 2], [256, 64]),
+        ([4, 4], [0], [256, 64, 16]),
+        ([2] * 6, [0], [256, 128, 64, 32, 16, 8, 4]),
+    ],
+)
+def test_get_images_reuses_matching_pyramid_levels(
+    pyramidal_tiff: tuple[Path, list[np.ndarray]],
+    scale_factors: list[int],
+    expected_file_levels: list[int],
+    expected_shapes: list[int],
+) -> None:
+    path, file_levels = pyramidal_tiff
+    image = _get_images(path.parent, path.name, image_models_kwargs={"scale_factors": scale_factors})
+    scales = [image[f"scale{i}"]["image"] for i in range(len(image))]
+    assert [scale.shape for scale in scales] == [(1, n, n) for n in expected_shapes]
+    for scale, i in zip(scales, expected_file_levels):
+        assert np.array_equal(scale.values[0], file_levels[i])
+    # the levels that are not in the file are computed from the full resolution level
+    if len(expected_file_levels) < len(expected_shapes):
+        assert not np.array_equal(scales[1].values[0], file_levels[[256, 128, 64].index(expected_shapes[1])])
+
+
+@pytest.mark.parametrize("scale_factors,expected_read_levels", [([4], [0, 2]), ([4, 4], [0]), ([2, 2], [0, 1, 2])])
+def test_get_images_only_reads_used_levels(
+    pyramidal_tiff: tuple[Path, list[np.ndarray]],
+    monkeypatch: pytest.MonkeyPatch,
+    scale_factors: list[int],
+    expected_read_levels: list[int],
+) -> None:
+    path, _ = pyramidal_tiff
+    read_levels = []
+    read_tiff_level = xenium_module._read_tiff_level
+
+    def _read_tiff_level_spy(*args: Any, level: int, **kwargs: Any) -> da.Array:
+        read_levels.append(level)
+        return read_tiff_level(*args, level=level, **kwargs)
+
+    monkeypatch.setattr(xenium_module, "_read_tiff_level", _read_tiff_level_spy)
+    _get_images(path.parent, path.name, image_models_kwargs={"scale_factors": scale_factors})
+    assert read_levels == expected_read_levels
+
+
+@pytest.mark.parametrize("scale_factors,expected_read_levels", [([4], [0, 2]), ([4, 4], [0]), (None, [0])])
+def test_get_images_channel_files_only_read_used_levels(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    scale_factors: Optional[list[int]],
+    expected_read_levels: list[int],
+) -> None:
+    files = [f"channel_{i}.tif" for i in range(2)]
+    for i, file in enumerate(files):
+        _write_pyramidal_tiff(tmp_path / file, seed=i)
+    read_levels = []
+    read_tiff_level = xenium_module._read_tiff_level
+
+    def _read_tiff_level_spy(*args: Any, level: int, **kwargs: Any) -> da.Array:
+        read_levels.append(level)
+        return read_tiff_level(*args, level=level, **kwargs)
+
+    monkeypatch.setattr(xenium_module, "_read_tiff_level", _read_tiff_level_spy)
+    _get_images(tmp_path, files, image_models_kwargs={"scale_factors": scale_factors})
+    # each level is read from both files
+    assert read_levels == [level for level in expected_read_levels for _ in files]
+
+
+def test_get_images_computes_pyramid_with_method(pyramidal_tiff: tuple[Path, list[np.ndarray]]) -> None:
+    path, file_levels = pyramidal_tiff
+    image = _get_images(
+        path.parent, path.name, image_models_kwargs={"scale_factors": [2], "method": Methods.XARRAY_COARSEN}
+    )
+    assert not np.array_equal(image["scale1"]["image"].values[0], file_levels[1])
+
+
+@pytest.mark.parametrize(
+    "scale_factors,expected_file_levels,expected_shapes",
+    [
+        ([2, 2], [0, 1, 2], [256, 128, 64]),
+        ([4], [0, 2], [256, 64]),
+        ([2, 2, 2, 2], [0], [256, 128, 64, 32, 16]),
+    ],
+)
+def test_get_images_channel_files_reuse_matching_pyramid_levels(
+    tmp_path: Path, scale_factors: list[int], expected_file_levels: list[int], expected_shapes: list[int]
+) -> None:
+    files = [f"channel_{i}.tif" for i in range(2)]
+    file_levels = [_write_pyramidal_tiff(tmp_path / file, seed=i) for i, file in enumerate(files)]
+    image = _get_images(tmp_path, files, image_models_kwargs={"scale_factors": scale_factors})
+    scales = [image[f"scale{i}"]["image"] for i in range(len(image))]
+    assert [scale.shape for scale in scales] == [(2, n, n) for n in expected_shapes]
+    for scale, i in zip(scales, expected_file_levels):
+        assert np.array_equal(scale.values, np.stack([levels[i] for levels in file_levels]))
+    if len(expected_file_levels) < len(expected_shapes):
+        assert not np.array_equal(scales[1].values[0], file_levels[0][1])
+
+
+@pytest.fixture
+def xenium_dataset(tmp_path: Path) -> Path:
+    # a minimal Xenium 1.x dataset, without the labels
+    rng = np.random.default_rng(0)
+    n_cells, n_genes = 10, 4
+    cell_ids = cell_id_str_from_prefix_suffix_uint32(np.arange(1, n_cells + 1, dtype=np.uint32), np.ones(n_cells))
+    genes = np.array([f"gene_{i}" for i in range(n_genes)])
+    (tmp_path / "experiment.xenium").write_text(
+        json.dumps({"analysis_sw_version": "xenium-1.4.0.1", "pixel_size": 0.2125})
+    )
+    pq.write_table(
+        pa.table(
+            {
+                "cell_id": cell_ids,
+                "x_centroid": rng.uniform(10, 50, n_cells),
+                "y_centroid": rng.uniform(10, 50, n_cells),
+                "transcript_counts": rng.integers(0, 10, n_cells),
+                "cell_area": rng.uniform(5, 30, n_cells),
+                "nucleus_area": rng.uniform(1, 5, n_cells),
+            }
+        ),
+        tmp_path / "cells.parquet",
+    )
+    counts = scipy.sparse.csc_matrix(rng.integers(0, 5, (n_genes, n_cells)).astype(np.int32))
+    with h5py.File(tmp_path / "cell_feature_matrix.h5", "w") as f:
+        matrix = f.create_group("matrix")
+        matrix["data"] = counts.data
+        matrix["indices"] = counts.indices
+        matrix["indptr"] = counts.indptr
+        matrix["shape"] = np.array(counts.shape)
+        matrix["barcodes"] = cell_ids.astype("S")
+        features = matrix.create_group("features")
+        features["name"] = genes.astype("S")
+        features["id"] = genes.astype("S")
+        features["feature_type"] = np.array([b"Gene Expression"] * n_genes)
+        features["genome"] = np.array([b"genome"] * n_genes)
+    angles = np.linspace(0, 2 * np.pi, 7)
+    centers = rng.uniform(10, 50, (n_cells, 2))
+    for file in ["cell_boundaries.parquet", "nucleus_boundaries.parquet"]:
+        pq.write_table(
+            pa.table(
+                {
+                    "cell_id": np.repeat(cell_ids, len(angles)),
+                    "vertex_x": (centers[:, :1] + 3 * np.cos(angles)).ravel(),
+                    "vertex_y": (centers[:, 1:] + 3 * np.sin(angles)).ravel(),
+                }
+            ),
+            tmp_path / file,
+        )
+    n_transcripts = 100
+    pq.write_table(
+        pa.table(
+            {
+                "cell_id": cell_ids[rng.integers(0, n_cells, n_transcripts)],
+                "feature_name": genes[rng.integers(0, n_genes, n_transcripts)],
+                "x_location": rng.uniform(0, 50, n_transcripts),
+                "y_location": rng.uniform(0, 50, n_transcripts),
+                "z_location": rng.uniform(10, 20, n_transcripts),
+                "qv": rng.uniform(0, 40, n_transcripts),
+                "overlaps_nucleus": rng.integers(0, 2, n_transcripts).astype(np.uint8),
+            }
+        ),
+        tmp_path / "transcripts.parquet",
+    )
+    _write_pyramidal_tiff(tmp_path / "morphology_mip.ome.tif", seed=1)
+    _write_pyramidal_tiff(tmp_path / "morphology_focus.ome.tif", seed=2)
+    tifffile.imwrite(
+        tmp_path / "sample_if_image.ome.tif",
+        rng.integers(0, 255, (3, 64, 64), dtype=np.uint8),
+        tile=(32, 32),
+        metadata={"axes": "CYX"},
+    )
+    return tmp_path
+
+
+def test_xenium_n_jobs(xenium_dataset: Path) -> None:
+    kwargs = {"cells_as_circles": True, "cells_labels": False, "nucleus_labels": False}
+    sequential = xenium(xenium_dataset, n_jobs=1, **kwargs)
+    parallel = xenium(xenium_dataset, n_jobs=4, **kwargs)
+
+    assert set(parallel.images.keys()) == {"morphology_mip", "morphology_focus", "if_image"}
+    assert set(parallel.shapes.keys()) == {"cell_boundaries", "nucleus_boundaries", "cell_circles"}
+    assert set(parallel.points.keys()) == {"transcripts"}
+    for name in sequential.images:
+        for scale in sequential.images[name]:
+            expected = sequential.images[name][scale]["image"]
+            assert np.array_equal(parallel.images[name][scale]["image"].values, expected.values)
+    for name in sequential.shapes:
+        assert parallel.shapes[name].index.equals(sequential.shapes[name].index)
+        assert parallel.shapes[name].geometry.geom_equals_exact(sequential.shapes[name].geometry, tolerance=0).all()
+    pd.testing.assert_frame_equal(parallel.points["transcripts"].compute(), sequential.points["transcripts"].compute())
+    pd.testing.assert_frame_equal(parallel["table"].obs, sequential["table"].obs)
+
+
+def test_xenium_n_jobs_zero(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="n_jobs"):
+        xenium(tmp_path, cells_as_circles=False, n_jobs=0)
+
+
+def test_xenium_invalid_morphology_focus_dir(tmp_path: Path) -> None:
+    (tmp_path / "experiment.xenium").write_text(
+        json.dumps({"analysis_sw_version": "xenium-2.0.0.6-35-ga7e17149a", "pixel_size": 0.2125})
+    )
+    (tmp_path / "morphology_focus").mkdir()
+    for i in range(2):
+        (tmp_path / "morphology_focus" / f"morphology_focus_000{i}.ome.tif").touch()
+    with pytest.raises(ValueError, match="Expected 1 .* or 4 .* files in the morphology focus directory"):
+        xenium(
+            tmp_path,
+            cells_boundaries=False,
+            nucleus_boundaries=False,
+            cells_as_circles=False,
+            cells_labels=False,
+            nucleus_labels=False,
+            transcripts=False,
+            aligned_images=False,
+            cells_table=False,
+        )
+
+
 # The datasets should be downloaded from
 # https://www.10xgenomics.com/support/software/xenium-onboard-analysis/latest/resources/xenium-example-data#test-data
 # and placed in the "data" directory; if you run the tests locally you may need to create a symlink in "tests/data"